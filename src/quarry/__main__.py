@@ -12,6 +12,8 @@ def main() -> None:
         output_dir=args.output_dir,
         game_version=args.version,
         categories=args.categories,
+        pretty=args.pretty,
+        text_cache=args.text_cache,
     )
 
 
@@ -1,7 +1,7 @@
 """Wiki category definitions for Old World data extraction.
 
 Each category specifies its source XML file, display name,
-and an optional filter predicate.
+and optional filter rules and/or filter predicate.
 """
 
 from dataclasses import dataclass, field
@@ -9,114 +9,46 @@ from typing import Any, Callable
 
 EntryFilter = Callable[[dict[str, Any]], bool]
 
+# Rule checks applied to entry.get(key). TRUE/FALSE test for an explicit
+# boolean; NOT_TRUE/NOT_FALSE also accept an absent field (the game default).
+TRUE, FALSE, NOT_TRUE, NOT_FALSE, NOT_NONE, IS_NONE, POSITIVE = range(7)
 
-def no_filter(entry: dict[str, Any]) -> bool:
-    """Accept all entries."""
-    return True
-
-
-def encyclopedia_default_true(entry: dict[str, Any]) -> bool:
-    """Include entries where bEncyclopedia defaults to true (most types).
-
-    Excludes only entries that explicitly set bEncyclopedia=0.
-    """
-    return entry.get("bEncyclopedia") is not False
-
-
-def encyclopedia_default_false(entry: dict[str, Any]) -> bool:
-    """Include entries where bEncyclopedia defaults to false (missions).
-
-    Requires bEncyclopedia to be explicitly set to 1.
-    """
-    return entry.get("bEncyclopedia") is True
-
-
-def projects_filter(entry: dict[str, Any]) -> bool:
-    """Encyclopedia-visible, non-hidden projects."""
-    return entry.get("bEncyclopedia") is not False and entry.get("bHidden") is not True
-
-
-def improvements_filter(entry: dict[str, Any]) -> bool:
-    """Buildable, non-wonder, non-religious improvements."""
-    return (
-        entry.get("bEncyclopedia") is not False
-        and entry.get("bBuild") is True
-        and entry.get("bWonder") is not True
-        and entry.get("ReligionPrereq") is None
-    )
-
+_CHECKS: tuple[Callable[[Any], bool], ...] = (
+    lambda v: v is True,
+    lambda v: v is False,
+    lambda v: v is not True,
+    lambda v: v is not False,
+    lambda v: v is not None,
+    lambda v: v is None,
+    lambda v: (v or 0) > 0,
+)
 
-def wonders_filter(entry: dict[str, Any]) -> bool:
-    """Encyclopedia-visible wonders."""
-    return entry.get("bEncyclopedia") is not False and entry.get("bWonder") is True
+FilterRules = tuple[tuple[str, int], ...]
 
 
-def religious_improvements_filter(entry: dict[str, Any]) -> bool:
-    """Encyclopedia-visible religious improvements (non-wonder)."""
-    return (
-        entry.get("bEncyclopedia") is not False
-        and entry.get("bWonder") is not True
-        and entry.get("ReligionPrereq") is not None
-    )
-
-
-def special_improvements_filter(entry: dict[str, Any]) -> bool:
-    """Encyclopedia-visible, non-buildable, non-wonder, non-religious."""
-    return (
-        entry.get("bEncyclopedia") is not False
-        and entry.get("bBuild") is not True
-        and entry.get("bWonder") is not True
-        and entry.get("ReligionPrereq") is None
-    )
-
-
-def dynasties_filter(entry: dict[str, Any]) -> bool:
-    """Only dynasties with a first ruler defined."""
-    return entry.get("FirstRuler") is not None
-
-
-def characters_filter(entry: dict[str, Any]) -> bool:
-    """Only characters with a first name defined."""
-    return entry.get("FirstName") is not None
-
-
-def archetypes_filter(entry: dict[str, Any]) -> bool:
-    """Archetype traits visible in encyclopedia."""
-    return entry.get("bArchetype") is True and entry.get("bEncyclopedia") is not False
-
+def match_rules(entry: dict[str, Any], rules: FilterRules) -> bool:
+    """Return True if every (xml_field, check) rule holds for the entry."""
+    for key, check in rules:
+        if not _CHECKS[check](entry.get(key)):
+            return False
+    return True
 
-def traits_filter(entry: dict[str, Any]) -> bool:
-    """Non-archetype, non-strength/weakness, non-item encyclopedia traits."""
-    return (
-        entry.get("bEncyclopedia") is not False
-        and entry.get("bArchetype") is not True
-        and entry.get("bWeakness") is not True
-        and entry.get("bStrength") is not True
-        and entry.get("bItem") is not True
-    )
 
+def no_filter(entry: dict[str, Any]) -> bool:
+    """Accept all entries."""
+    return True
 
-def strengths_weaknesses_filter(entry: dict[str, Any]) -> bool:
-    """Strengths and weaknesses (non-archetype, non-item)."""
-    return (
-        entry.get("bEncyclopedia") is not False
-        and entry.get("bArchetype") is not True
-        and (entry.get("bWeakness") is True or entry.get("bStrength") is True)
-        and entry.get("bItem") is not True
-    )
 
+def strength_or_weakness(entry: dict[str, Any]) -> bool:
+    """Traits flagged as a strength or a weakness."""
+    return entry.get("bWeakness") is True or entry.get("bStrength") is True
 
-def items_filter(entry: dict[str, Any]) -> bool:
-    """Item traits."""
-    return entry.get("bItem") is True
 
+# Default-true bEncyclopedia: excludes only entries that explicitly set it to 0.
+ENCYCLOPEDIA_DEFAULT_TRUE: FilterRules = (("bEncyclopedia", NOT_FALSE),)
 
-def national_ambitions_filter(entry: dict[str, Any]) -> bool:
-    """Victory-eligible goals with positive subject weight."""
-    return (
-        entry.get("bVictoryEligible") is True
-        and (entry.get("iSubjectWeight") or 0) > 0
-    )
+# Default-false bEncyclopedia (missions): requires it to be explicitly set to 1.
+ENCYCLOPEDIA_DEFAULT_FALSE: FilterRules = (("bEncyclopedia", TRUE),)
 
 
 @dataclass(frozen=True)
@@ -136,6 +68,7 @@ class CategoryDef:
     display_name: str
     xml_file: str
     expansion_files: list[str] = field(default_factory=list)
+    filter_rules: FilterRules = ()
     filter_fn: EntryFilter = no_filter
     text_fields: list[TextField] = field(default_factory=list)
     exclude_fields: set[str] = field(default_factory=set)
@@ -304,7 +237,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="projects",
         display_name="Projects",
         xml_file="project.xml",
-        filter_fn=projects_filter,
+        filter_rules=(("bEncyclopedia", NOT_FALSE), ("bHidden", NOT_TRUE)),
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -347,7 +280,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="dynasties",
         display_name="Dynasties",
         xml_file="dynasty.xml",
-        filter_fn=dynasties_filter,
+        filter_rules=(("FirstRuler", NOT_NONE),),
         text_fields=[
             TextField("Name", "name"),
             TextField("Description", "description"),
@@ -357,7 +290,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="characters",
         display_name="Characters",
         xml_file="character.xml",
-        filter_fn=characters_filter,
+        filter_rules=(("FirstName", NOT_NONE),),
         text_fields=[
             TextField("FirstName", "name", text_key_prefix="TEXT_"),
         ],
@@ -366,7 +299,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="missions",
         display_name="Missions",
         xml_file="mission.xml",
-        filter_fn=encyclopedia_default_false,
+        filter_rules=ENCYCLOPEDIA_DEFAULT_FALSE,
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -375,7 +308,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="occurrences",
         display_name="Occurrences",
         xml_file="occurrence.xml",
-        filter_fn=encyclopedia_default_true,
+        filter_rules=ENCYCLOPEDIA_DEFAULT_TRUE,
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -384,7 +317,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="nationalAmbitions",
         display_name="National Ambitions",
         xml_file="goal.xml",
-        filter_fn=national_ambitions_filter,
+        filter_rules=(("bVictoryEligible", TRUE), ("iSubjectWeight", POSITIVE)),
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -402,7 +335,12 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="improvements",
         display_name="Improvements",
         xml_file="improvement.xml",
-        filter_fn=improvements_filter,
+        filter_rules=(
+            ("bEncyclopedia", NOT_FALSE),
+            ("bBuild", TRUE),
+            ("bWonder", NOT_TRUE),
+            ("ReligionPrereq", IS_NONE),
+        ),
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -411,7 +349,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="wonders",
         display_name="Wonders",
         xml_file="improvement.xml",
-        filter_fn=wonders_filter,
+        filter_rules=(("bEncyclopedia", NOT_FALSE), ("bWonder", TRUE)),
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -420,7 +358,11 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="religiousImprovements",
         display_name="Religious Improvements",
         xml_file="improvement.xml",
-        filter_fn=religious_improvements_filter,
+        filter_rules=(
+            ("bEncyclopedia", NOT_FALSE),
+            ("bWonder", NOT_TRUE),
+            ("ReligionPrereq", NOT_NONE),
+        ),
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -429,7 +371,12 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="specialImprovements",
         display_name="Special Improvements",
         xml_file="improvement.xml",
-        filter_fn=special_improvements_filter,
+        filter_rules=(
+            ("bEncyclopedia", NOT_FALSE),
+            ("bBuild", NOT_TRUE),
+            ("bWonder", NOT_TRUE),
+            ("ReligionPrereq", IS_NONE),
+        ),
         text_fields=[
             TextField("Name", "name"),
         ],
@@ -439,7 +386,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="archetypes",
         display_name="Archetypes",
         xml_file="trait.xml",
-        filter_fn=archetypes_filter,
+        filter_rules=(("bArchetype", TRUE), ("bEncyclopedia", NOT_FALSE)),
         text_fields=[
             TextField("GenderedName", "name"),
         ],
@@ -448,7 +395,13 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="traits",
         display_name="Traits",
         xml_file="trait.xml",
-        filter_fn=traits_filter,
+        filter_rules=(
+            ("bEncyclopedia", NOT_FALSE),
+            ("bArchetype", NOT_TRUE),
+            ("bWeakness", NOT_TRUE),
+            ("bStrength", NOT_TRUE),
+            ("bItem", NOT_TRUE),
+        ),
         text_fields=[
             TextField("GenderedName", "name"),
         ],
@@ -457,7 +410,12 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="traitsAdjectives",
         display_name="Strengths & Weaknesses",
         xml_file="trait.xml",
-        filter_fn=strengths_weaknesses_filter,
+        filter_rules=(
+            ("bEncyclopedia", NOT_FALSE),
+            ("bArchetype", NOT_TRUE),
+            ("bItem", NOT_TRUE),
+        ),
+        filter_fn=strength_or_weakness,
         text_fields=[
             TextField("GenderedName", "name"),
         ],
@@ -466,7 +424,7 @@ CATEGORIES: dict[str, CategoryDef] = {
         name="traitsItems",
         display_name="Items",
         xml_file="trait.xml",
-        filter_fn=items_filter,
+        filter_rules=(("bItem", TRUE),),
         text_fields=[
             TextField("GenderedName", "name"),
         ],
@@ -41,4 +41,18 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=None,
         help="Specific categories to extract (default: all)",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent JSON output for readability (default: compact)",
+    )
+    parser.add_argument(
+        "--text-cache",
+        type=Path,
+        default=None,
+        help=(
+            "SQLite file to keep the text dictionary in, reused across runs;"
+            " ignored for dictionaries under 10,000 entries (default: in memory)"
+        ),
+    )
     return parser.parse_args(argv)
@@ -1,19 +1,26 @@
 """Pipeline orchestrator: parse -> resolve -> filter -> normalize -> emit."""
 
+import functools
+import itertools
 import json
-import re
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from quarry.categories import CATEGORIES, CategoryDef
-from quarry.text_resolver import TextResolver
-from quarry.xml_parser import parse_xml_file
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Matches one or more lowercase letters at start, followed by an uppercase letter.
-_PREFIX_RE = re.compile(r"^[a-z]+(?=[A-Z])")
+from quarry.categories import CATEGORIES, CategoryDef, match_rules
+from quarry.text_resolver import TextResolver, get_text_resolver
+from quarry.xml_parser import detect_field_type, iter_parsed_files, parse_xml_file
 
 
+# XML field names come from a small fixed schema, so an unbounded cache
+# turns repeat calls from the per-entry loop into a single dict lookup.
+@functools.cache
 def normalize_field_name(xml_name: str) -> str:
     """Strip Hungarian prefix and produce camelCase JSON field name.
 
@@ -25,68 +32,212 @@ def normalize_field_name(xml_name: str) -> str:
         Name -> name
         EffectPlayer -> effectPlayer
     """
-    match = _PREFIX_RE.match(xml_name)
-    if match:
-        remainder = xml_name[match.end() :]
-        return remainder[0].lower() + remainder[1:]
-    else:
-        return xml_name[0].lower() + xml_name[1:]
+    # A Hungarian prefix is a run of lowercase letters followed by an
+    # uppercase letter. A plain character scan beats a regex on names this short.
+    i = 0
+    n = len(xml_name)
+    while i < n and "a" <= xml_name[i] <= "z":
+        i += 1
+    if 0 < i < n and "A" <= xml_name[i] <= "Z":
+        return xml_name[i].lower() + xml_name[i + 1 :]
+    return xml_name[0].lower() + xml_name[1:]
+
+
+# Entry extractors are generated per category (see _extractor_source) and
+# compiled once per distinct source.
+Extractor = Callable[
+    [dict[str, Any], Callable[[str], str | None], dict[str, str]],
+    dict[str, Any],
+]
+
+
+def _extractor_source(category: CategoryDef) -> str:
+    """Generate source for an extractor specialized to a category's schema.
+
+    The generated `extract(raw, resolve, renames)` walks a raw entry in XML
+    order with the skip set and each text field inlined as constants, so the
+    only per-field lookup left is `renames` for plain fields.
+    """
+    skip = {"zType", *category.exclude_fields}
+    text_fields = {tf.xml_field: tf for tf in category.text_fields}
+    lines = [
+        "def extract(raw, resolve, renames):",
+        "    out = {}",
+        "    for xml_field, value in raw.items():",
+        # A constant set literal compiles to a frozenset lookup
+        f"        if xml_field in {{{', '.join(map(repr, sorted(skip)))}}}:",
+        "            continue",
+    ]
+    for xml_field, tf in text_fields.items():
+        if xml_field in skip:
+            continue
+        # String-typed fields always parse to str, so skip the coercion
+        lookup = "value" if detect_field_type(xml_field) == "string" else "str(value)"
+        if tf.text_key_prefix:
+            lookup = f"{tf.text_key_prefix!r} + {lookup}"
+        lines += [
+            f"        if xml_field == {xml_field!r}:",
+            f"            resolved = resolve({lookup})",
+            "            if resolved is not None:",
+            f"                out[{tf.output_field!r}] = resolved",
+            "            continue",
+        ]
+    lines += [
+        # Omit False booleans from output (kept in parsed dict for filters)
+        "        if value is False:",
+        "            continue",
+        "        name = renames.get(xml_field)",
+        "        if name is None:",
+        "            name = renames[xml_field] = normalize_field_name(xml_field)",
+        "        out[name] = value",
+        "    return out",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@functools.cache
+def _compile_extractor(source: str) -> Extractor:
+    """Compile generated extractor source into a function."""
+    namespace: dict[str, Any] = {"normalize_field_name": normalize_field_name}
+    exec(compile(source, "<quarry-extractor>", "exec"), namespace)
+    return namespace["extract"]
+
+
+def _category_files(category: CategoryDef, infos_dir: Path) -> list[Path]:
+    """Base XML file plus any expansion files present for a category."""
+    paths = [infos_dir / category.xml_file]
+    for exp_file in category.expansion_files:
+        exp_path = infos_dir / exp_file
+        if exp_path.exists():
+            paths.append(exp_path)
+    return paths
 
 
 def process_category(
     category: CategoryDef,
     infos_dir: Path,
     text_resolver: TextResolver,
+    raw_entries: list[dict[str, Any]] | None = None,
 ) -> dict[str, dict[str, Any]]:
-    """Process a single category: parse, filter, resolve text, normalize."""
-    # Parse base XML file
-    raw_entries = parse_xml_file(infos_dir / category.xml_file)
+    """Process a single category: parse, filter, resolve text, normalize.
 
-    # Parse and merge expansion files
-    for exp_file in category.expansion_files:
-        exp_path = infos_dir / exp_file
-        if exp_path.exists():
-            raw_entries.extend(parse_xml_file(exp_path))
+    `raw_entries` may carry already-parsed base and expansion entries (see
+    run_pipeline); they are read but not modified. When omitted, the
+    category's files are parsed here.
+    """
+    if raw_entries is None:
+        raw_entries = [
+            entry
+            for path in _category_files(category, infos_dir)
+            for entry in parse_xml_file(path)
+        ]
 
-    # Filter entries
-    filtered = [e for e in raw_entries if category.filter_fn(e)]
+    rules = category.filter_rules
+    filter_fn = category.filter_fn
 
-    # Build text field lookup for fast matching
-    text_field_map = {tf.xml_field: tf for tf in category.text_fields}
+    # Specialize the per-entry transform to this category's fields
+    extract = _compile_extractor(_extractor_source(category))
+    renames: dict[str, str] = {}
+    resolve = text_resolver.resolve
 
-    # Transform each entry
-    result: dict[str, dict[str, Any]] = {}
-    for raw in filtered:
-        z_type = raw.get("zType")
-        if z_type is None:
-            continue
+    # Filter and transform in a single pass, keyed by zType
+    result: dict[str, dict[str, Any]] = {
+        z_type: extract(raw, resolve, renames)
+        for raw in raw_entries
+        if (z_type := raw.get("zType")) is not None
+        and match_rules(raw, rules)
+        and filter_fn(raw)
+    }
 
-        output_entry: dict[str, Any] = {}
-        for xml_field, value in raw.items():
-            if xml_field == "zType":
-                continue
-            if xml_field in category.exclude_fields:
-                continue
+    return result
+
+
+def _encode_json(data: Any, pretty: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON, using orjson when installed.
 
-            # Resolve text fields
-            tf = text_field_map.get(xml_field)
-            if tf is not None:
-                lookup_key = tf.text_key_prefix + str(value)
-                resolved = text_resolver.resolve(lookup_key)
-                if resolved is not None:
-                    output_entry[tf.output_field] = resolved
-                continue
+    Output is compact by default; `pretty` indents with 2 spaces. Data
+    orjson refuses (such as integers beyond 64 bits) is encoded with the
+    stdlib encoder instead.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else None
+        try:
+            return orjson.dumps(data, option=option)
+        except orjson.JSONEncodeError:
+            pass
+    if pretty:
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
 
-            # Omit False booleans from output (kept in parsed dict for filters)
-            if value is False:
-                continue
 
-            # Normalize field name and include
-            output_entry[normalize_field_name(xml_field)] = value
+def _write_json(path: Path, data: Any, pretty: bool = False) -> None:
+    """Write data to path as UTF-8 JSON (see _encode_json)."""
+    path.write_bytes(_encode_json(data, pretty))
 
-        result[z_type] = output_entry
 
-    return result
+# Pairs encoded per call by _write_json_items: enough to make the per-call
+# overhead negligible while keeping each chunk's dict small.
+_JSON_CHUNK_ITEMS = 5_000
+
+
+def _write_json_items(
+    path: Path, items: Iterable[tuple[str, Any]], pretty: bool = False
+) -> int:
+    """Write (key, value) pairs to path as one JSON object; return the pair count.
+
+    Pairs are encoded _JSON_CHUNK_ITEMS at a time and the chunks spliced
+    together, giving the same bytes as _write_json(path, dict(items), pretty)
+    without the whole dict ever existing. Keys must be unique.
+    """
+    count = 0
+    with open(path, "wb") as f:
+        f.write(b"{")
+        for chunk in itertools.batched(items, _JSON_CHUNK_ITEMS):
+            encoded = _encode_json(dict(chunk), pretty)
+            # Drop the chunk's own braces (and, pretty, the newline before "}")
+            f.write(b"," if count else b"")
+            f.write(encoded[1:-2] if pretty else encoded[1:-1])
+            count += len(chunk)
+        f.write(b"\n}" if pretty and count else b"}")
+    return count
+
+
+def _emit(
+    category: CategoryDef,
+    entries: dict[str, dict[str, Any]],
+    output_dir: Path,
+    language: str,
+    extracted_at: str,
+    game_version: str | None,
+    pretty: bool = False,
+) -> Path:
+    """Write one category's entries and metadata to its JSON file."""
+    meta: dict[str, str] = {
+        "category": category.name,
+        "language": language,
+        "extractedAt": extracted_at,
+    }
+    if game_version:
+        meta["gameVersion"] = game_version
+
+    output = {"meta": meta, "entries": entries}
+
+    out_path = output_dir / f"{category.name}.json"
+    _write_json(out_path, output, pretty)
+    return out_path
+
+
+def _emit_text_forms(text_resolver: TextResolver, output_dir: Path, pretty: bool) -> None:
+    """Write the _text-forms.json lookup table.
+
+    The forms are streamed from the resolver in chunks, so the full key ->
+    forms dict is never built.
+    """
+    forms_path = output_dir / "_text-forms.json"
+    count = _write_json_items(forms_path, text_resolver.iter_forms(), pretty)
+    print(f"  {count} text forms -> {forms_path}")
 
 
 def run_pipeline(
@@ -95,8 +246,17 @@ def run_pipeline(
     output_dir: Path,
     game_version: str | None = None,
     categories: list[str] | None = None,
+    pretty: bool = False,
+    text_cache: Path | None = None,
 ) -> None:
-    """Run the full extraction pipeline."""
+    """Run the full extraction pipeline.
+
+    XML files are parsed once each in worker processes, then each category
+    is processed in the requested order against one shared TextResolver.
+    Only parsing runs in parallel; the rest is GIL-bound Python. If
+    text_cache is given, the text dictionary is kept in a SQLite store at
+    that path (see TextResolver).
+    """
     infos_dir = game_path / "Reference" / "XML" / "Infos"
     if not infos_dir.is_dir():
         raise FileNotFoundError(f"Infos directory not found: {infos_dir}")
@@ -104,39 +264,55 @@ def run_pipeline(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"Loading text dictionary for '{language}'...")
-    text_resolver = TextResolver(infos_dir, language)
+    text_resolver = get_text_resolver(infos_dir, language, text_cache)
+    if text_resolver.cache_notice:
+        print(f"  {text_resolver.cache_notice}")
     print(f"  {len(text_resolver)} text entries loaded")
 
-    # Emit text forms lookup table
-    forms_path = output_dir / "_text-forms.json"
-    with open(forms_path, "w", encoding="utf-8") as f:
-        json.dump(text_resolver.forms, f, indent=2, ensure_ascii=False)
-    print(f"  {len(text_resolver.forms)} text forms -> {forms_path}")
+    _emit_text_forms(text_resolver, output_dir, pretty)
 
     # Determine which categories to process
     category_names = categories if categories else list(CATEGORIES.keys())
 
+    # One timestamp for the whole run so every category's meta agrees
+    extracted_at = datetime.now(timezone.utc).isoformat()
+
+    cat_defs: list[CategoryDef] = []
     for name in category_names:
         cat_def = CATEGORIES.get(name)
         if cat_def is None:
             print(f"  Warning: unknown category '{name}', skipping")
             continue
+        cat_defs.append(cat_def)
 
-        print(f"Processing '{cat_def.display_name}'...")
-        entries = process_category(cat_def, infos_dir, text_resolver)
-
-        meta: dict[str, str] = {
-            "category": cat_def.name,
-            "language": language,
-            "extractedAt": datetime.now(timezone.utc).isoformat(),
-        }
-        if game_version:
-            meta["gameVersion"] = game_version
-
-        output = {"meta": meta, "entries": entries}
-
-        out_path = output_dir / f"{cat_def.name}.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+    # Parse each distinct file once, across worker processes; split categories
+    # (improvement.xml, trait.xml) share the result. Files are parsed in the
+    # order categories first need them, and each file's entries are dropped
+    # after the last category that reads it.
+    files = {cat_def.name: _category_files(cat_def, infos_dir) for cat_def in cat_defs}
+    last_use = {
+        path: i for i, cat_def in enumerate(cat_defs) for path in files[cat_def.name]
+    }
+    pending = iter_parsed_files(list(last_use))
+    parsed: dict[Path, list[dict[str, Any]]] = {}
 
+    for i, cat_def in enumerate(cat_defs):
+        print(f"Processing '{cat_def.display_name}'...")
+        cat_files = files[cat_def.name]
+        for path in cat_files:
+            while path not in parsed:
+                parsed_path, parsed_entries = next(pending)
+                parsed[parsed_path] = parsed_entries
+        entries = process_category(
+            cat_def,
+            infos_dir,
+            text_resolver,
+            [entry for path in cat_files for entry in parsed[path]],
+        )
+        for path in cat_files:
+            if last_use[path] == i:
+                del parsed[path]
+        out_path = _emit(
+            cat_def, entries, output_dir, language, extracted_at, game_version, pretty
+        )
         print(f"  {len(entries)} entries -> {out_path}")
@@ -2,23 +2,174 @@
 
 Parses language.xml to determine the correct column name for a language code,
 then parses all text-*.xml files to build a text_key -> display_string dictionary.
+The dictionary can optionally be kept in an on-disk SQLite store instead of
+process memory, reused across runs while the text files are unchanged.
 """
 
+import functools
 import re
-import xml.etree.ElementTree as ET
+import sqlite3
+import sys
+from collections.abc import Iterator
 from pathlib import Path
 
+from quarry.xml_parser import iter_entries, map_files
+
 _TEXT_REF_RE = re.compile(r"\{(TEXT_\w+)\}")
 _MAX_RESOLVE_DEPTH = 3
+_MISSING = object()  # resolve() cache sentinel; None is a valid cached result
+# Below this many text entries an on-disk store saves too little memory to be
+# worth writing, so the dictionary simply stays in memory.
+_STORE_MIN_ENTRIES = 10_000
+
+
+def _parse_text_file(text_file: Path, field_name: str) -> dict[str, str]:
+    """Parse one text-*.xml file into a text_key -> raw (tilde-joined) text dict.
+
+    Module-level so it can be pickled for worker processes.
+    """
+    raw: dict[str, str] = {}
+    for entry in iter_entries(text_file):
+        # One walk over the children picks out both columns, without building
+        # a dict of every language's text. As with find(), the first
+        # occurrence of each tag wins.
+        z_type_el = lang_el = None
+        for child in entry:
+            if child.tag == "zType":
+                if z_type_el is None:
+                    z_type_el = child
+            elif child.tag == field_name:
+                if lang_el is None:
+                    lang_el = child
+        if z_type_el is None or lang_el is None:
+            continue
+        z_type, lang_text = z_type_el.text, lang_el.text
+        if z_type and lang_text:
+            raw[z_type.strip()] = lang_text.strip()
+
+    return raw
+
+
+def _text_fingerprint(text_files: list[Path], field_name: str) -> str:
+    """Identify the inputs a text store was built from (names, sizes, mtimes, language)."""
+    parts = [field_name]
+    for path in text_files:
+        stat = path.stat()
+        parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "\n".join(parts)
+
+
+class _StoreColumn:
+    """Read-only dict-like view of one column of a SQLite text store.
+
+    Provides just the dict methods TextResolver uses (get, items, len).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, column: str) -> None:
+        self._conn = conn
+        self._get_sql = f"SELECT {column} FROM texts WHERE key = ?"
+        self._items_sql = f"SELECT key, {column} FROM texts ORDER BY rowid"
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        row = self._conn.execute(self._get_sql, (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        # The cursor yields rows as they are read rather than all at once
+        return self._conn.execute(self._items_sql)
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+
+
+def _open_text_store(
+    path: Path, fingerprint: str
+) -> tuple[_StoreColumn, _StoreColumn] | None:
+    """Open an existing text store read-only as (display, raw) views.
+
+    Returns None if nothing exists at path or the store was built from
+    different inputs, in which case the caller rebuilds it. Raises
+    ValueError if path exists but is not a text store, so that whatever
+    is there is never overwritten.
+    """
+    if not path.exists():
+        return None
+    if not path.is_file():
+        raise ValueError(f"{path} is not a file")
+    try:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        raise ValueError(f"{path} could not be opened: {e}") from e
+    try:
+        row = conn.execute("SELECT fingerprint FROM meta").fetchone()
+    except sqlite3.Error as e:
+        conn.close()
+        raise ValueError(f"{path} is not a text store: {e}") from e
+    if row is None:
+        conn.close()
+        raise ValueError(f"{path} is not a text store: no fingerprint")
+    if row[0] != fingerprint:
+        conn.close()
+        return None
+    return _StoreColumn(conn, "display"), _StoreColumn(conn, "raw")
+
+
+def _write_text_store(
+    path: Path, fingerprint: str, display: dict[str, str], raw: dict[str, str]
+) -> None:
+    """Write the text dictionaries to a SQLite store at path.
+
+    Rows are inserted in dict order so `forms` keeps the same key order.
+    Written to a temporary file and renamed, so a reader never sees a
+    half-built store; the temporary file is removed if writing fails.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE meta (fingerprint TEXT NOT NULL)")
+                conn.execute("INSERT INTO meta VALUES (?)", (fingerprint,))
+                conn.execute(
+                    "CREATE TABLE texts (key TEXT PRIMARY KEY, display TEXT NOT NULL, raw TEXT NOT NULL)"
+                )
+                conn.executemany(
+                    "INSERT INTO texts VALUES (?, ?, ?)",
+                    ((key, display[key], text) for key, text in raw.items()),
+                )
+        finally:
+            conn.close()
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 class TextResolver:
-    """Loads and resolves Old World localized text strings."""
+    """Loads and resolves Old World localized text strings.
 
-    def __init__(self, infos_dir: Path, language: str = "en-US") -> None:
+    If cache_path is given, text is served from a SQLite store at that path
+    rather than held in memory. The store is built on first use and reused
+    until the text files change; small dictionaries stay in memory instead.
+    When a store is requested but not used, cache_notice says why (it is
+    None otherwise), for the caller to report.
+    """
+
+    def __init__(
+        self, infos_dir: Path, language: str = "en-US", cache_path: Path | None = None
+    ) -> None:
         field_name = self._validate_language(infos_dir, language)
-        self._dict, self._forms = self._build_dictionary(infos_dir, field_name)
-        self._gendered_dict = self._build_gendered_dictionary(infos_dir)
+        # One directory listing shared by the text and (lazy) gendered loaders.
+        # Sorted because iterdir() order is filesystem-dependent: file order
+        # decides which file wins a duplicate key and the key order of
+        # _text-forms.json, both of which must be reproducible.
+        self._xml_files = sorted(p for p in infos_dir.iterdir() if p.suffix == ".xml")
+        self._dict, self._raw_text, self.cache_notice = self._load_text(
+            field_name, cache_path
+        )
+        self._resolved_cache: dict[str, str | None] = {}
 
     def _validate_language(self, infos_dir: Path, language: str) -> str:
         """Validate language code against language.xml.
@@ -26,101 +177,205 @@ class TextResolver:
         Returns the XML element name used in text files for this language.
         Raises ValueError if the language code is not found.
         """
-        tree = ET.parse(infos_dir / "language.xml")
-        for entry in tree.getroot().findall("Entry"):
+        valid: list[str] = []
+        for entry in iter_entries(infos_dir / "language.xml"):
             field_name_el = entry.find("zFieldName")
-            if field_name_el is not None and field_name_el.text == language:
+            if field_name_el is None or not field_name_el.text:
+                continue
+            if field_name_el.text == language:
                 return language
-        valid = []
-        for entry in tree.getroot().findall("Entry"):
-            field_name_el = entry.find("zFieldName")
-            if field_name_el is not None and field_name_el.text:
-                valid.append(field_name_el.text)
+            valid.append(field_name_el.text)
         raise ValueError(
             f"Unknown language '{language}'. Valid options: {', '.join(valid)}"
         )
 
+    def _load_text(
+        self, field_name: str, cache_path: Path | None
+    ) -> tuple[
+        dict[str, str] | _StoreColumn, dict[str, str] | _StoreColumn, str | None
+    ]:
+        """Return (display, raw) lookups, from the text store when one applies.
+
+        The third item becomes cache_notice: why a requested store was not
+        used, or None.
+        """
+        if cache_path is None:
+            display, raw = self._build_dictionary(self._xml_files, field_name)
+            return display, raw, None
+
+        text_files = [p for p in self._xml_files if p.name.startswith("text-")]
+        fingerprint = _text_fingerprint(text_files, field_name)
+        try:
+            store = _open_text_store(cache_path, fingerprint)
+        except ValueError as e:
+            display, raw = self._build_dictionary(self._xml_files, field_name)
+            return display, raw, f"Text cache not used: {e}; leaving it untouched"
+        if store is not None:
+            return store[0], store[1], None
+
+        display, raw = self._build_dictionary(self._xml_files, field_name)
+        if len(raw) < _STORE_MIN_ENTRIES:
+            notice = (
+                f"Text cache not used: {len(raw)} entries is below"
+                f" {_STORE_MIN_ENTRIES}, keeping them in memory"
+            )
+            return display, raw, notice
+        try:
+            _write_text_store(cache_path, fingerprint, display, raw)
+            store = _open_text_store(cache_path, fingerprint)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            notice = f"Warning: could not write text cache {cache_path}: {e}"
+            return display, raw, notice
+        if store is None:
+            return display, raw, None
+        return store[0], store[1], None
+
     def _build_dictionary(
-        self, infos_dir: Path, field_name: str
-    ) -> tuple[dict[str, str], dict[str, list[str]]]:
+        self, xml_files: list[Path], field_name: str
+    ) -> tuple[dict[str, str], dict[str, str]]:
         """Parse all text-*.xml files and build lookup dictionaries.
 
         For each entry, extracts the zType and the text from the language column.
-        Returns a tuple of (display_dict, forms_dict) where display_dict maps
-        text keys to first tilde-separated form and forms_dict maps text keys
-        to the full list of tilde-separated forms.
-        """
-        display: dict[str, str] = {}
-        forms: dict[str, list[str]] = {}
-        for text_file in sorted(infos_dir.glob("text-*.xml")):
-            tree = ET.parse(text_file)
-            entries = tree.getroot().findall("Entry")
-            for entry in entries:
-                z_type_el = entry.find("zType")
-                if z_type_el is None or not z_type_el.text:
-                    continue
+        Returns a tuple of (display_dict, raw_dict) where display_dict maps
+        text keys to the first tilde-separated form and raw_dict maps text keys
+        to the full tilde-joined text (split on demand by `forms`).
 
-                lang_el = entry.find(field_name)
-                if lang_el is None or not lang_el.text:
-                    continue
+        Files are parsed in parallel worker processes and merged in sorted
+        filename order, so later files still win on key collisions.
+        """
+        text_files = [p for p in xml_files if p.name.startswith("text-")]
+        results = map_files(_parse_text_file, text_files, field_name)
 
-                text_key = z_type_el.text.strip()
-                raw_text = lang_el.text.strip()
+        display: dict[str, str] = {}
+        raw: dict[str, str] = {}
+        # Keys are interned here rather than in the workers, since interning
+        # does not survive pickling back to this process.
+        for file_raw in results:
+            for text_key, raw_text in file_raw.items():
+                text_key = sys.intern(text_key)
+                display[text_key] = raw_text.partition("~")[0]
+                raw[text_key] = raw_text
 
-                parts = raw_text.split("~")
-                display[text_key] = parts[0]
-                forms[text_key] = parts
+        return display, raw
 
-        return display, forms
+    def _build_gendered_dictionary(self, xml_files: list[Path]) -> dict[str, str | None]:
+        """Parse all genderedText*.xml files to map GENDERED_TEXT_* keys to display strings.
 
-    def _build_gendered_dictionary(self, infos_dir: Path) -> dict[str, str]:
-        """Parse all genderedText*.xml files to map GENDERED_TEXT_* keys to masculine TEXT_* keys."""
-        result: dict[str, str] = {}
-        for gendered_path in sorted(infos_dir.glob("genderedText*.xml")):
-            tree = ET.parse(gendered_path)
-            for entry in tree.getroot().findall("Entry"):
-                z_type_el = entry.find("zType")
-                if z_type_el is None or not z_type_el.text:
+        Each key is joined to the display string of its masculine TEXT_* key
+        here, so resolving it later takes one lookup instead of two.
+        """
+        result: dict[str, str | None] = {}
+        gendered_paths = [p for p in xml_files if p.name.startswith("genderedText")]
+        for gendered_path in gendered_paths:
+            for entry in iter_entries(gendered_path):
+                z_type_el = texts_el = None
+                for child in entry:
+                    if child.tag == "zType":
+                        if z_type_el is None:
+                            z_type_el = child
+                    elif child.tag == "Texts":
+                        if texts_el is None:
+                            texts_el = child
+                if z_type_el is None or texts_el is None:
                     continue
-
-                texts_el = entry.find("Texts")
-                if texts_el is None:
+                z_type = z_type_el.text
+                if not z_type:
                     continue
 
-                gendered_key = z_type_el.text.strip()
-                for pair in texts_el.findall("Pair"):
+                gendered_key = sys.intern(z_type.strip())
+                for pair in texts_el.iterfind("Pair"):
                     index_el = pair.find("zIndex")
                     value_el = pair.find("zValue")
                     if (index_el is not None and value_el is not None
                             and index_el.text == "GRAMMATICAL_GENDER_MASCULINE"
                             and value_el.text):
-                        result[gendered_key] = value_el.text.strip()
+                        result[gendered_key] = self._dict.get(value_el.text.strip())
                         break
 
         return result
 
-    def resolve(self, text_key: str, _depth: int = 0) -> str | None:
+    def resolve(self, text_key: str) -> str | None:
         """Look up a text key and return the localized display string.
 
         Handles GENDERED_TEXT_* keys by resolving through genderedText.xml
         to the masculine TEXT_* key first, then looking up the display string.
-        Recursively resolves any {TEXT_*} references found in the result.
+        Expands any {TEXT_*} references found in the result, up to
+        _MAX_RESOLVE_DEPTH levels deep. Results are memoized per key.
         """
+        cached = self._resolved_cache.get(text_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
         if text_key.startswith("GENDERED_TEXT_"):
-            text_key = self._gendered_dict.get(text_key, text_key)
-        result = self._dict.get(text_key)
-        if result is None or _depth >= _MAX_RESOLVE_DEPTH:
-            return result
-        return _TEXT_REF_RE.sub(
-            lambda m: self.resolve(m.group(1), _depth + 1) or m.group(0),
-            result,
-        )
+            result = self._gendered.get(text_key, _MISSING)
+            if result is _MISSING:
+                result = self._dict.get(text_key)
+        else:
+            result = self._dict.get(text_key)
+
+        depth = 0
+        while result is not None and depth < _MAX_RESOLVE_DEPTH and "{TEXT_" in result:
+            result = _TEXT_REF_RE.sub(self._substitute_ref, result)
+            depth += 1
+
+        self._resolved_cache[text_key] = result
+        return result
+
+    def _substitute_ref(self, match: re.Match[str]) -> str:
+        """Replace one {TEXT_*} reference with its raw text, if known."""
+        return self._dict.get(match.group(1)) or match.group(0)
+
+    @functools.cached_property
+    def _gendered(self) -> dict[str, str | None]:
+        """GENDERED_TEXT_* -> masculine display string map, parsed on first use."""
+        return self._build_gendered_dictionary(self._xml_files)
+
+    def iter_forms(self) -> Iterator[tuple[str, list[str]]]:
+        """Yield each text key with its tilde-separated forms, in dictionary order.
+
+        With a text store the rows are streamed from SQLite, so the forms
+        table never has to be held in memory as a whole.
+        """
+        for key, text in self._raw_text.items():
+            yield key, text.split("~")
 
     @property
     def forms(self) -> dict[str, list[str]]:
-        """All text keys mapped to their tilde-separated forms."""
-        return self._forms
+        """All text keys mapped to their tilde-separated forms.
+
+        Built on each access rather than cached, so the (large) result is
+        freed once the caller drops it instead of living as long as the
+        shared resolver. Prefer iter_forms() when a pass over it is enough.
+        """
+        return dict(self.iter_forms())
 
     def __len__(self) -> int:
         """Number of text entries loaded."""
         return len(self._dict)
+
+
+def get_text_resolver(
+    infos_dir: Path, language: str = "en-US", cache_path: Path | None = None
+) -> TextResolver:
+    """Return a shared TextResolver for (infos_dir, language, cache_path).
+
+    Builds the resolver on first use and returns the same instance for later
+    calls with the same resolved directory, language and cache path. Callers
+    must treat it as read-only, since any mutation would leak into every
+    other user.
+    """
+    return _cached_text_resolver(
+        str(infos_dir.resolve()),
+        language,
+        str(cache_path.resolve()) if cache_path is not None else None,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_text_resolver(
+    infos_dir: str, language: str, cache_path: str | None
+) -> TextResolver:
+    """Build a TextResolver; cached on hashable (directory, language, cache path) keys."""
+    return TextResolver(
+        Path(infos_dir), language, Path(cache_path) if cache_path is not None else None
+    )
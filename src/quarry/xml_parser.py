@@ -4,15 +4,38 @@ Parses any XML file from Reference/XML/Infos/ by inspecting
 Hungarian notation prefixes to determine field types.
 """
 
-import re
+import functools
+import os
+import sys
 import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
-
-
-# Regex: one or more lowercase letters at the start, followed by an uppercase letter.
-# The matched group is the Hungarian prefix.
-_PREFIX_RE = re.compile(r"^([a-z]+)(?=[A-Z])")
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+# Parsing backend. lxml is an optional accelerator (`pip install quarry[fast]`);
+# its Element API is ElementTree-compatible, so the rest of the module is
+# written against the stdlib interface and `ET` is kept for annotations.
+try:
+    from lxml import etree as _ET
+
+    _LXML = True
+except ImportError:
+    _ET = ET
+    _LXML = False
+
+# lxml iterparse options. Comments and processing instructions are dropped so
+# that iterating an element yields only real child elements, as with the
+# stdlib parser.
+_LXML_OPTIONS: dict[str, Any] = {
+    "remove_comments": True,
+    "remove_pis": True,
+    "remove_blank_text": True,
+    "huge_tree": True,
+}
 
 # Known prefixes mapped to parse strategies, checked longest-first.
 _PREFIX_TO_STRATEGY: list[tuple[str, str]] = [
@@ -29,7 +52,46 @@ _PREFIX_TO_STRATEGY: list[tuple[str, str]] = [
     ("e", "string"),
 ]
 
+# The Hungarian prefix is the whole leading lowercase run, so lookup is exact.
+_PREFIX_MAP: dict[str, str] = dict(_PREFIX_TO_STRATEGY)
+
 
+def iter_entries(path: Path) -> Iterator[ET.Element]:
+    """Stream the top-level <Entry> elements of an XML file.
+
+    Each Entry is cleared and detached from the root once the caller moves
+    on, so only one Entry is held in memory at a time instead of the whole
+    document. Callers must not keep references to yielded elements.
+    """
+    if _LXML:
+        for _, entry in _ET.iterparse(
+            str(path), events=("end",), tag="Entry", **_LXML_OPTIONS
+        ):
+            parent = entry.getparent()
+            if parent is None or parent.getparent() is not None:
+                continue  # Only direct children of the root element
+            yield entry
+            entry.clear()
+            while entry.getprevious() is not None:
+                del parent[0]
+        return
+
+    depth = 0
+    root = None
+    for event, element in _ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1 and element.tag == "Entry":
+            yield element
+            root.clear()
+
+
+# Tag names come from a small fixed schema and repeat across every entry.
+@functools.cache
 def detect_field_type(tag: str) -> str:
     """Determine the parse strategy for a field based on its XML tag name.
 
@@ -37,147 +99,235 @@ def detect_field_type(tag: str) -> str:
     'sparse_int_map', 'sparse_bool_map', 'sparse_string_map',
     'sparse_enum_list_map', 'sparse_2d_map'.
     """
-    match = _PREFIX_RE.match(tag)
-    if not match:
+    # The prefix is one or more lowercase letters followed by an uppercase
+    # letter; scan for it directly rather than running a regex per tag.
+    i = 0
+    n = len(tag)
+    while i < n and "a" <= tag[i] <= "z":
+        i += 1
+    if i == 0 or i == n or not "A" <= tag[i] <= "Z":
         return "string"
 
-    prefix = match.group(1)
-    for known_prefix, strategy in _PREFIX_TO_STRATEGY:
-        if prefix == known_prefix:
-            return strategy
-
-    return "string"
+    return _PREFIX_MAP.get(tag[:i], "string")
 
 
 def _get_text(element: ET.Element) -> str | None:
     """Get the text content of an element, returning None if empty."""
     text = element.text
-    if text is None or text.strip() == "":
+    if text is None:
         return None
-    return text.strip()
+    return text.strip() or None
+
+
+def _parse_int(element: ET.Element) -> int | str | None:
+    """Parse an integer, mapping the -1 sentinel to None."""
+    text = element.text
+    if text is None:
+        return None
+    try:
+        # int() tolerates surrounding whitespace, so parse before stripping
+        value = int(text)
+    except ValueError:
+        # Empty, or a string in an i-prefixed field (e.g. iTriggerSubject)
+        text = text.strip()
+        return text if text and text != "NONE" else None
+    return None if value == -1 else value
+
+
+def _parse_float(element: ET.Element) -> float | None:
+    """Parse a float."""
+    text = _get_text(element)
+    if text is None:
+        return None
+    return float(text)
+
+
+def _parse_bool(element: ET.Element) -> bool | None:
+    """Parse a boolean ("1" is true), keeping explicit False."""
+    text = element.text
+    if text is None:
+        return None
+    text = text.strip()
+    if not text:
+        return None
+    return text == "1"
+
+
+def _parse_string(element: ET.Element) -> str | None:
+    """Parse a string, mapping the NONE sentinel to None."""
+    text = element.text
+    if text is None:
+        return None
+    text = text.strip()
+    if not text or text == "NONE":
+        return None
+    return text
+
+
+def _parse_string_list(element: ET.Element) -> list[str] | dict[str, str] | None:
+    """Parse a list of <zValue> strings."""
+    # Some ae-prefixed fields use <Pair> structure instead of <zValue>.
+    # Detect and delegate to sparse_string_map if so.
+    if element.find("Pair") is not None:
+        return _parse_sparse_string_map(element)
+    return [s for child in element if (s := (child.text or "").strip())]
+
+
+# Sparse maps read each <Pair>'s children in one pass rather than
+# calling find() once per expected child tag. Like find(), the first child
+# with a given tag wins; later duplicates are ignored.
+def _parse_sparse_int_map(element: ET.Element) -> dict[str, int] | None:
+    """Parse <Pair> zIndex/iValue children into a dict."""
+    result: dict[str, int] = {}
+    for pair in element.iterfind("Pair"):
+        key_el = val_el = None
+        for child in pair:
+            if child.tag == "zIndex":
+                if key_el is None:
+                    key_el = child
+            elif child.tag == "iValue":
+                if val_el is None:
+                    val_el = child
+        if key_el is None or val_el is None:
+            continue
+        key, val = key_el.text, val_el.text
+        if key and val and not val.isspace():
+            key = key.strip()
+            if key:
+                result[key] = int(val)
+    return result if result else None
+
+
+def _parse_sparse_bool_map(element: ET.Element) -> list[str] | None:
+    """Parse <Pair> zIndex/bValue children into the list of true keys."""
+    keys: list[str] = []
+    for pair in element.iterfind("Pair"):
+        key_el = val_el = None
+        for child in pair:
+            if child.tag == "zIndex":
+                if key_el is None:
+                    key_el = child
+            elif child.tag == "bValue":
+                if val_el is None:
+                    val_el = child
+        if key_el is None or val_el is None:
+            continue
+        key, val = key_el.text, val_el.text
+        if key and val and val.strip() == "1":
+            key = key.strip()
+            if key:
+                keys.append(key)
+    return keys if keys else None
+
+
+def _parse_sparse_string_map(element: ET.Element) -> dict[str, str] | None:
+    """Parse <Pair> zIndex/zValue children into a dict."""
+    result_s: dict[str, str] = {}
+    for pair in element.iterfind("Pair"):
+        key_el = val_el = None
+        for child in pair:
+            if child.tag == "zIndex":
+                if key_el is None:
+                    key_el = child
+            elif child.tag == "zValue":
+                if val_el is None:
+                    val_el = child
+        if key_el is None or val_el is None:
+            continue
+        key, val = key_el.text, val_el.text
+        if key and val:
+            key = key.strip()
+            val = val.strip()
+            if key and val:
+                result_s[key] = val
+    return result_s if result_s else None
+
+
+def _parse_sparse_enum_list_map(element: ET.Element) -> dict[str, list[str]] | None:
+    """Parse <Pair> zIndex plus repeated zValue children into a dict of lists."""
+    result_ael: dict[str, list[str]] = {}
+    for pair in element.iterfind("Pair"):
+        key_el = None
+        values: list[str] = []
+        for child in pair:
+            if child.tag == "zIndex":
+                if key_el is None:
+                    key_el = child
+            elif child.tag == "zValue" and (s := (child.text or "").strip()):
+                values.append(s)
+        if key_el is None:
+            continue
+        key = key_el.text
+        if key and values:
+            key = key.strip()
+            if key:
+                result_ael[key] = values
+    return result_ael if result_ael else None
+
+
+def _parse_sparse_2d_map(element: ET.Element) -> dict[str, dict[str, int]] | None:
+    """Parse <Pair> zIndex and <SubPair> zSubIndex/iValue into nested dicts."""
+    result_2d: dict[str, dict[str, int]] = {}
+    for pair in element.iterfind("Pair"):
+        # SubPairs are only read once the Pair has a usable key
+        key_el = pair.find("zIndex")
+        key = _get_text(key_el) if key_el is not None else None
+        if not key:
+            continue
+        sub_map: dict[str, int] = {}
+        for sub_pair in pair.iterfind("SubPair"):
+            sub_key_el = sub_val_el = None
+            for sub_child in sub_pair:
+                if sub_child.tag == "zSubIndex":
+                    if sub_key_el is None:
+                        sub_key_el = sub_child
+                elif sub_child.tag == "iValue":
+                    if sub_val_el is None:
+                        sub_val_el = sub_child
+            if sub_key_el is None or sub_val_el is None:
+                continue
+            sub_key, sub_val = sub_key_el.text, sub_val_el.text
+            if sub_key and sub_val and not sub_val.isspace():
+                sub_key = sub_key.strip()
+                if sub_key:
+                    sub_map[sub_key] = int(sub_val)
+        if sub_map:
+            result_2d[key] = sub_map
+    return result_2d if result_2d else None
+
+
+# Parse strategy -> handler, so dispatch is one dict lookup rather than a
+# chain of string comparisons.
+_HANDLERS: dict[str, Callable[[ET.Element], Any]] = {
+    "int": _parse_int,
+    "float": _parse_float,
+    "bool": _parse_bool,
+    "string": _parse_string,
+    "string_list": _parse_string_list,
+    "sparse_int_map": _parse_sparse_int_map,
+    "sparse_bool_map": _parse_sparse_bool_map,
+    "sparse_string_map": _parse_sparse_string_map,
+    "sparse_enum_list_map": _parse_sparse_enum_list_map,
+    "sparse_2d_map": _parse_sparse_2d_map,
+}
 
 
 def parse_field(element: ET.Element, field_type: str) -> Any:
     """Parse an XML element according to its detected field type."""
-    match field_type:
-        case "int":
-            text = _get_text(element)
-            if text is None:
-                return None
-            try:
-                value = int(text)
-            except ValueError:
-                # Some i-prefixed fields contain strings (e.g. iTriggerSubject)
-                return text if text != "NONE" else None
-            return None if value == -1 else value
-
-        case "float":
-            text = _get_text(element)
-            if text is None:
-                return None
-            return float(text)
-
-        case "bool":
-            text = _get_text(element)
-            if text is None:
-                return None
-            return text == "1"
-
-        case "string":
-            text = _get_text(element)
-            if text is None or text == "NONE":
-                return None
-            return text
-
-        case "string_list":
-            # Some ae-prefixed fields use <Pair> structure instead of <zValue>.
-            # Detect and delegate to sparse_string_map if so.
-            if element.find("Pair") is not None:
-                return parse_field(element, "sparse_string_map")
-            return [
-                child.text.strip()
-                for child in element
-                if child.text and child.text.strip()
-            ]
-
-        case "sparse_int_map":
-            result: dict[str, int] = {}
-            for pair in element.findall("Pair"):
-                index_el = pair.find("zIndex")
-                value_el = pair.find("iValue")
-                if index_el is not None and value_el is not None:
-                    key = _get_text(index_el)
-                    val = _get_text(value_el)
-                    if key and val:
-                        result[key] = int(val)
-            return result if result else None
-
-        case "sparse_bool_map":
-            keys: list[str] = []
-            for pair in element.findall("Pair"):
-                index_el = pair.find("zIndex")
-                value_el = pair.find("bValue")
-                if index_el is not None and value_el is not None:
-                    key = _get_text(index_el)
-                    val = _get_text(value_el)
-                    if key and val == "1":
-                        keys.append(key)
-            return keys if keys else None
-
-        case "sparse_string_map":
-            result_s: dict[str, str] = {}
-            for pair in element.findall("Pair"):
-                index_el = pair.find("zIndex")
-                value_el = pair.find("zValue")
-                if index_el is not None and value_el is not None:
-                    key = _get_text(index_el)
-                    val = _get_text(value_el)
-                    if key and val:
-                        result_s[key] = val
-            return result_s if result_s else None
-
-        case "sparse_enum_list_map":
-            result_ael: dict[str, list[str]] = {}
-            for pair in element.findall("Pair"):
-                index_el = pair.find("zIndex")
-                if index_el is None:
-                    continue
-                key = _get_text(index_el)
-                if not key:
-                    continue
-                values = [
-                    child.text.strip()
-                    for child in pair.findall("zValue")
-                    if child.text and child.text.strip()
-                ]
-                if values:
-                    result_ael[key] = values
-            return result_ael if result_ael else None
-
-        case "sparse_2d_map":
-            result_2d: dict[str, dict[str, int]] = {}
-            for pair in element.findall("Pair"):
-                index_el = pair.find("zIndex")
-                if index_el is None:
-                    continue
-                key = _get_text(index_el)
-                if not key:
-                    continue
-                sub_map: dict[str, int] = {}
-                for sub_pair in pair.findall("SubPair"):
-                    sub_index = sub_pair.find("zSubIndex")
-                    sub_value = sub_pair.find("iValue")
-                    if sub_index is not None and sub_value is not None:
-                        sub_key = _get_text(sub_index)
-                        sub_val = _get_text(sub_value)
-                        if sub_key and sub_val:
-                            sub_map[sub_key] = int(sub_val)
-                if sub_map:
-                    result_2d[key] = sub_map
-            return result_2d if result_2d else None
-
-        case _:
-            return _get_text(element)
+    return _HANDLERS.get(field_type, _get_text)(element)
+
+
+# Tag -> (interned tag, handler), filled the first time each tag is seen.
+# lxml returns a fresh string per .tag access, so storing the interned tag
+# lets every parsed entry share one key object per field name, and one dict
+# probe replaces type detection plus handler lookup per child.
+_TAG_HANDLERS: dict[str, tuple[str, Callable[[ET.Element], Any]]] = {}
+
+
+def _tag_handler(tag: str) -> tuple[str, Callable[[ET.Element], Any]]:
+    """Resolve and cache the interned tag and parse handler for a field."""
+    cached = _TAG_HANDLERS[tag] = (sys.intern(tag), _HANDLERS[detect_field_type(tag)])
+    return cached
 
 
 def parse_entry(entry_element: ET.Element) -> dict[str, Any]:
@@ -189,9 +339,11 @@ def parse_entry(entry_element: ET.Element) -> dict[str, Any]:
     """
     result: dict[str, Any] = {}
     for child in entry_element:
-        tag = child.tag
-        field_type = detect_field_type(tag)
-        value = parse_field(child, field_type)
+        cached = _TAG_HANDLERS.get(child.tag)
+        if cached is None:
+            cached = _tag_handler(child.tag)
+        tag, handler = cached
+        value = handler(child)
 
         if value is None:
             continue
@@ -201,27 +353,71 @@ def parse_entry(entry_element: ET.Element) -> dict[str, Any]:
     return result
 
 
-def _is_schema_entry(entry: ET.Element) -> bool:
-    """Check if an Entry is a schema template (empty zType)."""
-    z_type = entry.find("zType")
-    if z_type is None:
-        return True
-    return z_type.text is None or z_type.text.strip() == ""
-
-
 def parse_xml_file(path: Path) -> list[dict[str, Any]]:
     """Parse an entire XML data file, returning all data entries.
 
     Skips schema template entries (detected by empty zType).
     Base game files have a schema entry as their first Entry;
-    expansion files do not.
+    expansion files do not. Entries are streamed, so only the parsed
+    dicts are kept in memory, not the document tree.
+    """
+    entries: list[dict[str, Any]] = []
+    for entry in iter_entries(path):
+        # Schema template entries have an empty or missing zType
+        z_type = entry.find("zType")
+        if z_type is None or not z_type.text or z_type.text.isspace():
+            continue
+        entries.append(parse_entry(entry))
+    return entries
+
+
+def map_files(
+    fn: Callable[..., _T],
+    paths: list[Path],
+    *args: Any,
+    workers: int | None = None,
+) -> list[_T]:
+    """Call fn(path, *args) for each path in worker processes.
+
+    Results are returned in the order of `paths`. `fn` must be a
+    module-level function so it can be pickled. With a single path (or a
+    single worker) the work runs inline, avoiding process start-up.
+    """
+    workers = min(len(paths), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [fn(path, *args) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, paths, *([arg] * len(paths) for arg in args)))
+
+
+def imap_files(
+    fn: Callable[..., _T],
+    paths: list[Path],
+    *args: Any,
+    workers: int | None = None,
+) -> Iterator[_T]:
+    """Like map_files, but yield each result in order as the caller asks.
+
+    At most `workers` calls are queued ahead of the caller, so only that
+    many finished results wait in memory at a time.
     """
-    tree = ET.parse(path)
-    root = tree.getroot()
-    entries = root.findall("Entry")
-
-    return [
-        parse_entry(entry)
-        for entry in entries
-        if not _is_schema_entry(entry)
-    ]
+    workers = min(len(paths), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for path in paths:
+            yield fn(path, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        queued = deque(executor.submit(fn, path, *args) for path in paths[:workers])
+        for path in paths[workers:]:
+            result = queued.popleft().result()
+            queued.append(executor.submit(fn, path, *args))
+            yield result
+        while queued:
+            yield queued.popleft().result()
+
+
+def iter_parsed_files(
+    paths: list[Path], workers: int | None = None
+) -> Iterator[tuple[Path, list[dict[str, Any]]]]:
+    """Parse several XML data files in parallel, yielding (path, entries) in order."""
+    return zip(paths, imap_files(parse_xml_file, paths, workers=workers))
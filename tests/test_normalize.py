@@ -0,0 +1,83 @@
+"""Parity checks for the Hungarian-prefix character scans.
+
+normalize_field_name and detect_field_type used to match the prefix with a
+regex; these tests keep the regex as the reference and compare against it.
+"""
+
+import itertools
+import re
+
+import pytest
+
+from quarry.pipeline import normalize_field_name
+from quarry.xml_parser import _PREFIX_TO_STRATEGY, detect_field_type
+
+_PREFIX_RE = re.compile(r"^([a-z]+)(?=[A-Z])")
+
+NAMES = [
+    "iCost",
+    "bHide",
+    "zIconName",
+    "aeNationValid",
+    "aaiYieldRate",
+    "aaeFlags",
+    "abValid",
+    "azNames",
+    "fScale",
+    "eType",
+    "Name",
+    "EffectPlayer",
+    "zType",
+    "iC",
+    "x",
+    "X",
+    "abc",
+    "ABC",
+    "i1Cost",
+    "i_Cost",
+    "iÉtat",
+    "écart",
+    "qwertyUiop",
+]
+
+# Every string of length 1-4 over characters on and around the
+# lowercase/uppercase boundaries the scan tests.
+EXHAUSTIVE = [
+    "".join(chars)
+    for length in range(1, 5)
+    for chars in itertools.product("aiZA1_éÉ", repeat=length)
+]
+
+
+def _regex_normalize(xml_name: str) -> str:
+    match = _PREFIX_RE.match(xml_name)
+    if match:
+        remainder = xml_name[match.end() :]
+        return remainder[0].lower() + remainder[1:]
+    return xml_name[0].lower() + xml_name[1:]
+
+
+def _regex_detect(tag: str) -> str:
+    match = _PREFIX_RE.match(tag)
+    if not match:
+        return "string"
+    for known_prefix, strategy in _PREFIX_TO_STRATEGY:
+        if match.group(1) == known_prefix:
+            return strategy
+    return "string"
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_normalize_field_name_matches_regex(name: str) -> None:
+    assert normalize_field_name(name) == _regex_normalize(name)
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_detect_field_type_matches_regex(name: str) -> None:
+    assert detect_field_type(name) == _regex_detect(name)
+
+
+def test_prefix_scans_match_regex_exhaustively() -> None:
+    for name in EXHAUSTIVE:
+        assert normalize_field_name(name) == _regex_normalize(name), name
+        assert detect_field_type(name) == _regex_detect(name), name
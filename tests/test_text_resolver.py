@@ -0,0 +1,197 @@
+"""Checks for TextResolver's optional SQLite text store.
+
+A store-backed resolver must give the same answers as the in-memory one,
+be rebuilt when its inputs change, and fall back to memory (leaving any
+foreign file alone) when it cannot be used.
+"""
+
+import os
+
+import pytest
+
+from quarry import text_resolver
+from quarry.text_resolver import TextResolver
+
+LANGUAGE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Root>
+  <Entry><zType /><zFieldName /></Entry>
+  <Entry><zType>LANGUAGE_ENGLISH</zType><zFieldName>en-US</zFieldName></Entry>
+  <Entry><zType>LANGUAGE_GERMAN</zType><zFieldName>de-DE</zFieldName></Entry>
+</Root>
+"""
+
+TEXT_A_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Root>
+  <Entry><zType>TEXT_ZULU</zType><en-US>Zulu~Zulus</en-US><de-DE>Zulu DE</de-DE></Entry>
+  <Entry><zType>TEXT_ALPHA</zType><en-US> Alpha~Alphas~of Alpha </en-US><de-DE>Alpha DE</de-DE></Entry>
+  <Entry><zType>TEXT_REF</zType><en-US>See {TEXT_ALPHA} and {TEXT_UNKNOWN}</en-US></Entry>
+  <Entry><zType>TEXT_KING</zType><en-US>King~Kings</en-US><de-DE>König</de-DE></Entry>
+  <Entry><zType>TEXT_QUEEN</zType><en-US>Queen</en-US><de-DE>Königin</de-DE></Entry>
+  <Entry><zType>TEXT_OVERRIDE</zType><en-US>from a</en-US></Entry>
+</Root>
+"""
+
+TEXT_B_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Root>
+  <Entry><zType>TEXT_OVERRIDE</zType><en-US>from b</en-US><de-DE>aus b</de-DE></Entry>
+  <Entry><zType>TEXT_MIDDLE</zType><en-US>Middle</en-US></Entry>
+</Root>
+"""
+
+GENDERED_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Root>
+  <Entry>
+    <zType>GENDERED_TEXT_RULER</zType>
+    <Texts>
+      <Pair><zIndex>GRAMMATICAL_GENDER_FEMININE</zIndex><zValue>TEXT_QUEEN</zValue></Pair>
+      <Pair><zIndex>GRAMMATICAL_GENDER_MASCULINE</zIndex><zValue>TEXT_KING</zValue></Pair>
+    </Texts>
+  </Entry>
+  <Entry>
+    <zType>GENDERED_TEXT_MISSING</zType>
+    <Texts>
+      <Pair><zIndex>GRAMMATICAL_GENDER_MASCULINE</zIndex><zValue>TEXT_NOWHERE</zValue></Pair>
+    </Texts>
+  </Entry>
+</Root>
+"""
+
+KEYS = [
+    "TEXT_ZULU",
+    "TEXT_ALPHA",
+    "TEXT_REF",
+    "TEXT_KING",
+    "TEXT_OVERRIDE",
+    "TEXT_MIDDLE",
+    "TEXT_UNKNOWN",
+    "GENDERED_TEXT_RULER",
+    "GENDERED_TEXT_MISSING",
+    "GENDERED_TEXT_UNKNOWN",
+]
+
+
+@pytest.fixture
+def infos_dir(tmp_path):
+    infos = tmp_path / "Infos"
+    infos.mkdir()
+    (infos / "language.xml").write_text(LANGUAGE_XML, encoding="utf-8")
+    (infos / "text-a.xml").write_text(TEXT_A_XML, encoding="utf-8")
+    (infos / "text-b.xml").write_text(TEXT_B_XML, encoding="utf-8")
+    (infos / "genderedText.xml").write_text(GENDERED_XML, encoding="utf-8")
+    return infos
+
+
+@pytest.fixture
+def small_store(monkeypatch):
+    """Let the tiny test dictionaries be written to a store."""
+    monkeypatch.setattr(text_resolver, "_STORE_MIN_ENTRIES", 1)
+
+
+def _uses_store(resolver):
+    return isinstance(resolver._dict, text_resolver._StoreColumn)
+
+
+def test_store_matches_memory(infos_dir, tmp_path, small_store):
+    memory = TextResolver(infos_dir)
+    TextResolver(infos_dir, cache_path=tmp_path / "text.db")  # builds the store
+    stored = TextResolver(infos_dir, cache_path=tmp_path / "text.db")
+
+    assert _uses_store(stored)
+    assert stored.cache_notice is None
+    assert len(stored) == len(memory)
+    assert [stored.resolve(key) for key in KEYS] == [memory.resolve(key) for key in KEYS]
+    assert stored.resolve("GENDERED_TEXT_RULER") == "King"
+    assert stored.resolve("TEXT_REF") == "See Alpha and {TEXT_UNKNOWN}"
+    assert stored.resolve("TEXT_OVERRIDE") == "from b"
+    assert list(stored.iter_forms()) == list(memory.iter_forms())
+    assert list(stored.forms.items()) == list(memory.forms.items())
+    assert stored.forms["TEXT_ALPHA"] == ["Alpha", "Alphas", "of Alpha"]
+
+
+def test_store_is_reused_without_parsing(infos_dir, tmp_path, small_store, monkeypatch):
+    cache_path = tmp_path / "text.db"
+    TextResolver(infos_dir, cache_path=cache_path)
+
+    def fail(*args):
+        raise AssertionError("text files parsed despite a current store")
+
+    monkeypatch.setattr(TextResolver, "_build_dictionary", fail)
+    resolver = TextResolver(infos_dir, cache_path=cache_path)
+    assert _uses_store(resolver)
+    assert resolver.resolve("TEXT_ZULU") == "Zulu"
+
+
+def test_store_rebuilt_when_text_file_changes(infos_dir, tmp_path, small_store):
+    cache_path = tmp_path / "text.db"
+    TextResolver(infos_dir, cache_path=cache_path)
+
+    # Same mtime, different size
+    text_b = infos_dir / "text-b.xml"
+    stat = text_b.stat()
+    text_b.write_text(TEXT_B_XML.replace("Middle", "Middle ground"), encoding="utf-8")
+    os.utime(text_b, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    resolver = TextResolver(infos_dir, cache_path=cache_path)
+    assert _uses_store(resolver)
+    assert resolver.resolve("TEXT_MIDDLE") == "Middle ground"
+
+    # Same size, different mtime
+    text_b.write_text(TEXT_B_XML.replace("Middle", "Middle GROUND"), encoding="utf-8")
+    stat = text_b.stat()
+    os.utime(text_b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    resolver = TextResolver(infos_dir, cache_path=cache_path)
+    assert resolver.resolve("TEXT_MIDDLE") == "Middle GROUND"
+
+
+def test_store_rebuilt_when_language_changes(infos_dir, tmp_path, small_store):
+    cache_path = tmp_path / "text.db"
+    assert TextResolver(infos_dir, cache_path=cache_path).resolve("TEXT_KING") == "King"
+
+    german = TextResolver(infos_dir, "de-DE", cache_path=cache_path)
+    assert _uses_store(german)
+    assert german.resolve("TEXT_KING") == "König"
+    assert german.resolve("TEXT_MIDDLE") is None
+
+
+def test_small_dictionary_stays_in_memory(infos_dir, tmp_path):
+    cache_path = tmp_path / "text.db"
+    resolver = TextResolver(infos_dir, cache_path=cache_path)
+
+    assert not _uses_store(resolver)
+    assert "below" in resolver.cache_notice
+    assert not cache_path.exists()
+    assert resolver.resolve("TEXT_ZULU") == "Zulu"
+
+
+def test_directory_cache_path_falls_back_to_memory(infos_dir, tmp_path, small_store):
+    cache_path = tmp_path / "cache"
+    cache_path.mkdir()
+    resolver = TextResolver(infos_dir, cache_path=cache_path)
+
+    assert not _uses_store(resolver)
+    assert "not a file" in resolver.cache_notice
+    assert cache_path.is_dir() and not any(cache_path.iterdir())
+    assert resolver.resolve("GENDERED_TEXT_RULER") == "King"
+
+
+def test_unwritable_cache_path_falls_back_to_memory(infos_dir, tmp_path, small_store):
+    # The parent is a regular file, so the store cannot be created even as root
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    resolver = TextResolver(infos_dir, cache_path=blocker / "text.db")
+
+    assert not _uses_store(resolver)
+    assert resolver.cache_notice.startswith("Warning: could not write text cache")
+    assert blocker.read_text() == ""
+    assert resolver.resolve("TEXT_ZULU") == "Zulu"
+
+
+@pytest.mark.parametrize("content", [b"not a database", b""])
+def test_foreign_file_is_left_untouched(infos_dir, tmp_path, small_store, content):
+    cache_path = tmp_path / "notes.txt"
+    cache_path.write_bytes(content)
+    resolver = TextResolver(infos_dir, cache_path=cache_path)
+
+    assert not _uses_store(resolver)
+    assert "leaving it untouched" in resolver.cache_notice
+    assert cache_path.read_bytes() == content
+    assert resolver.resolve("TEXT_ZULU") == "Zulu"
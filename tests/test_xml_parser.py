@@ -0,0 +1,181 @@
+"""Behaviour checks for parse_xml_file, run under both parsing backends.
+
+The parser picks lxml when it is installed and falls back to the stdlib
+ElementTree otherwise; every test here runs against each backend so the two
+stay in agreement.
+"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from quarry import xml_parser
+from quarry.xml_parser import parse_xml_file
+
+
+@pytest.fixture(params=["stdlib", "lxml"])
+def backend(request, monkeypatch):
+    if request.param == "lxml":
+        etree = pytest.importorskip("lxml.etree")
+        monkeypatch.setattr(xml_parser, "_ET", etree)
+        monkeypatch.setattr(xml_parser, "_LXML", True)
+    else:
+        monkeypatch.setattr(xml_parser, "_ET", ET)
+        monkeypatch.setattr(xml_parser, "_LXML", False)
+    return request.param
+
+
+def _parse(tmp_path, body):
+    path = tmp_path / "data.xml"
+    path.write_text(f'<?xml version="1.0" encoding="utf-8"?>\n<Root>{body}</Root>')
+    return parse_xml_file(path)
+
+
+def test_schema_entries_are_skipped(backend, tmp_path):
+    entries = _parse(
+        tmp_path,
+        """
+        <Entry><zType /><zName /></Entry>
+        <Entry><zName>no type</zName></Entry>
+        <Entry><zType>   </zType></Entry>
+        <Entry><zType>UNIT_A</zType></Entry>
+        <Entry><zType> UNIT_B </zType></Entry>
+        """,
+    )
+    assert entries == [{"zType": "UNIT_A"}, {"zType": "UNIT_B"}]
+
+
+def test_scalar_whitespace_and_sentinels(backend, tmp_path):
+    (entry,) = _parse(
+        tmp_path,
+        """
+        <Entry>
+          <zType>UNIT_A</zType>
+          <zName>  Name  </zName>
+          <zIcon>NONE</zIcon>
+          <eClass> NONE </eClass>
+          <zEmpty>   </zEmpty>
+          <iCost> 5 </iCost>
+          <iUnset>-1</iUnset>
+          <iNone>NONE</iNone>
+          <iTriggerSubject> SUBJECT_X </iTriggerSubject>
+          <iBlank />
+          <fScale> 1.5 </fScale>
+          <bHide> 1 </bHide>
+          <bShow>0</bShow>
+          <bBlank>  </bBlank>
+          <!-- comment -->
+          <Plain> text </Plain>
+        </Entry>
+        """,
+    )
+    assert entry == {
+        "zType": "UNIT_A",
+        "zName": "Name",
+        "iCost": 5,
+        "iTriggerSubject": "SUBJECT_X",
+        "fScale": 1.5,
+        "bHide": True,
+        "bShow": False,
+        "Plain": "text",
+    }
+
+
+def test_string_list(backend, tmp_path):
+    (entry,) = _parse(
+        tmp_path,
+        """
+        <Entry>
+          <zType>UNIT_A</zType>
+          <aeNations>
+            <zValue> NATION_A </zValue>
+            <zValue>  </zValue>
+            <!-- comment -->
+            <zValue>NATION_B</zValue>
+          </aeNations>
+          <aeNames>
+            <Pair><zIndex> K </zIndex><zValue> V </zValue></Pair>
+          </aeNames>
+        </Entry>
+        """,
+    )
+    assert entry["aeNations"] == ["NATION_A", "NATION_B"]
+    assert entry["aeNames"] == {"K": "V"}
+
+
+def test_sparse_maps_first_duplicate_wins(backend, tmp_path):
+    (entry,) = _parse(
+        tmp_path,
+        """
+        <Entry>
+          <zType>UNIT_A</zType>
+          <aiYield>
+            <Pair><zIndex>Y1</zIndex><zIndex>Y2</zIndex><iValue>1</iValue></Pair>
+            <Pair><zIndex> Y3 </zIndex><iValue> 2 </iValue><iValue>9</iValue></Pair>
+            <Pair><iValue>4</iValue></Pair>
+            <Pair><zIndex>Y4</zIndex><iValue>  </iValue></Pair>
+          </aiYield>
+          <abValid>
+            <Pair><zIndex>A</zIndex><bValue> 1 </bValue><bValue>0</bValue></Pair>
+            <Pair><zIndex>B</zIndex><bValue>0</bValue><bValue>1</bValue></Pair>
+            <Pair><zIndex>  </zIndex><bValue>1</bValue></Pair>
+          </abValid>
+          <azNames>
+            <Pair><zIndex>K1</zIndex><zValue> first </zValue><zValue>second</zValue></Pair>
+            <Pair><zIndex>K2</zIndex><zValue>  </zValue></Pair>
+          </azNames>
+          <aaeFlags>
+            <Pair><zIndex>K</zIndex><zIndex>L</zIndex><zValue>A</zValue><zValue> B </zValue></Pair>
+            <Pair><zIndex>M</zIndex><zValue>  </zValue></Pair>
+          </aaeFlags>
+        </Entry>
+        """,
+    )
+    assert entry["aiYield"] == {"Y1": 1, "Y3": 2}
+    assert entry["abValid"] == ["A"]
+    assert entry["azNames"] == {"K1": "first"}
+    assert entry["aaeFlags"] == {"K": ["A", "B"]}
+
+
+def test_sparse_2d_map(backend, tmp_path):
+    (entry,) = _parse(
+        tmp_path,
+        """
+        <Entry>
+          <zType>UNIT_A</zType>
+          <aaiRate>
+            <Pair>
+              <zIndex> Y0 </zIndex>
+              <SubPair><zSubIndex>S0</zSubIndex><zSubIndex>S9</zSubIndex><iValue>1</iValue></SubPair>
+              <SubPair><zSubIndex>S1</zSubIndex><iValue> 2 </iValue><iValue>9</iValue></SubPair>
+              <SubPair><zSubIndex>S2</zSubIndex><iValue> </iValue></SubPair>
+            </Pair>
+            <Pair>
+              <zIndex>  </zIndex>
+              <SubPair><zSubIndex>S0</zSubIndex><iValue>not a number</iValue></SubPair>
+            </Pair>
+            <Pair>
+              <zIndex>Y1</zIndex>
+              <SubPair><iValue>3</iValue></SubPair>
+            </Pair>
+          </aaiRate>
+        </Entry>
+        """,
+    )
+    assert entry["aaiRate"] == {"Y0": {"S0": 1, "S1": 2}}
+
+
+def test_empty_sparse_maps_are_omitted(backend, tmp_path):
+    (entry,) = _parse(
+        tmp_path,
+        """
+        <Entry>
+          <zType>UNIT_A</zType>
+          <aiYield />
+          <abValid><Pair><zIndex>A</zIndex><bValue>0</bValue></Pair></abValid>
+          <azNames><Pair><zIndex>K</zIndex></Pair></azNames>
+          <aaiRate><Pair><zIndex>Y0</zIndex></Pair></aaiRate>
+        </Entry>
+        """,
+    )
+    assert entry == {"zType": "UNIT_A"}